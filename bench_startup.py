@@ -0,0 +1,61 @@
+"""Startup benchmark for the dashboard.
+
+    python bench_startup.py            # 5 runs each
+    python bench_startup.py --runs 10
+
+Every measurement runs in a fresh interpreter so module caches start cold:
+
+    import     `import app` (what kpi_server.py / export scripts pay)
+    paint      first full script run of a session via streamlit's AppTest
+    rerun      second run in the same process (warm imports, new session state)
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+IMPORT_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import app
+print(json.dumps({"s": time.perf_counter() - t, "plotly": "plotly.express" in sys.modules}))
+"""
+
+PAINT_PROBE = """
+import json, time
+from streamlit.testing.v1 import AppTest
+t = time.perf_counter()
+AppTest.from_file("app.py", default_timeout=120).run()
+first = time.perf_counter() - t
+t = time.perf_counter()
+AppTest.from_file("app.py", default_timeout=120).run()
+print(json.dumps({"paint": first, "rerun": time.perf_counter() - t}))
+"""
+
+
+def _probe(code: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kaltstart- und First-Paint-Zeiten messen")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    imports = [_probe(IMPORT_PROBE) for _ in range(args.runs)]
+    paints = [_probe(PAINT_PROBE) for _ in range(args.runs)]
+    rows = {
+        "import": [r["s"] for r in imports],
+        "paint":  [r["paint"] for r in paints],
+        "rerun":  [r["rerun"] for r in paints],
+    }
+    for name, values in rows.items():
+        print(f"{name:<7} median {statistics.median(values) * 1000:8.1f} ms   "
+              f"min {min(values) * 1000:8.1f} ms   ({len(values)} runs)")
+    print(f"plotly imported by `import app`: {any(r['plotly'] for r in imports)}")
+
+
+if __name__ == "__main__":
+    main()
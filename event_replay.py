@@ -0,0 +1,63 @@
+"""Replays the planned roster as a live task-event stream (stand-in for clock-in terminals).
+
+    python event_replay.py --out events.jsonl --speed 60         # 1 roster minute per second
+    python event_replay.py --tcp 127.0.0.1:8503 --speed 600 --jitter 4
+    python event_replay.py --out events.jsonl --speed 0          # whole day at once
+
+Point the dashboard's live mode at the same file (or tcp://host:port). With --jitter
+every event is shifted by a normal offset (minutes), so actual and plan diverge.
+"""
+import argparse
+import json
+import socket
+import time
+
+import app
+
+
+def _lines(events):
+    for ev in events.itertuples(index=False):
+        rec = {"ts": ev.ts.isoformat(), "dienst": ev.dienst, "event": ev.event}
+        if ev.event == "start":
+            rec["task"], rec["typ"] = ev.task, ev.typ
+        yield ev.ts, json.dumps(rec, ensure_ascii=False) + "\n"
+
+
+def replay(events, write, speed: float):
+    """Write every event; with speed > 0 wait (roster seconds / speed) between them."""
+    t0, wall0 = None, time.monotonic()
+    for ts, line in _lines(events):
+        if speed > 0:
+            t0 = t0 or ts
+            delay = (ts - t0).total_seconds() / speed - (time.monotonic() - wall0)
+            if delay > 0:
+                time.sleep(delay)
+        write(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dienstplan als Live-Ereignisstrom abspielen")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="JSONL-Datei, an die Ereignisse angehängt werden")
+    target.add_argument("--tcp", help="host:port, auf dem ein Client bedient wird")
+    parser.add_argument("--speed", type=float, default=60.0, help="Zeitraffer-Faktor, 0 = ohne Pause")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Streuung der Ist-Zeiten in Minuten")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    events = app.plan_events(app.DataWarehouse.get_combined_data(), args.jitter, args.seed)
+    if args.out:
+        with open(args.out, "a", encoding="utf-8") as fh:
+            replay(events, lambda line: (fh.write(line), fh.flush()), args.speed)
+    else:
+        host, port = args.tcp.rsplit(":", 1)
+        with socket.create_server((host, int(port))) as server:
+            print(f"Warte auf Verbindung auf {args.tcp} …")
+            conn, _ = server.accept()
+            with conn:
+                replay(events, lambda line: conn.sendall(line.encode("utf-8")), args.speed)
+    print(f"{len(events)} Ereignisse abgespielt")
+
+
+if __name__ == "__main__":
+    main()
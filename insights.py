@@ -0,0 +1,169 @@
+"""KPI commentary through a pluggable text backend.
+
+    KITCHEN_OPS_LLM=stub     (default) local template text, offline and deterministic
+    KITCHEN_OPS_LLM=gemini   google-generativeai, needs GOOGLE_API_KEY
+    KITCHEN_OPS_LLM_CACHE=/path/to/dir   keep answers on disk across restarts
+
+Input is a compact, JSON-serialisable summary per site/day (see app.kpi_summary). Answers
+are cached by a hash of the summary, backend and prompt version, so an unchanged roster
+never reaches the backend twice. narrate_many() sends the cache misses in batches: one
+request carries up to `batch_size` summaries and returns one text per summary.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+NARRATIVE_BACKEND_ENV = "KITCHEN_OPS_LLM"
+NARRATIVE_CACHE_ENV   = "KITCHEN_OPS_LLM_CACHE"
+NARRATIVE_MODEL       = "gemini-1.5-flash"
+NARRATIVE_BATCH_SIZE  = 8
+NARRATIVE_CACHE_SIZE  = 1024
+PROMPT_VERSION        = 1
+
+PROMPT = """Du bist Betriebsanalyst für eine Spitalküche mit Gastrodienst.
+Du erhältst {n} Zusammenfassungen als JSON-Liste. Schreibe für jede einen Kommentar auf
+Deutsch (Schweiz, ohne ß), 3–5 Sätze, sachlich, für die Betriebsleitung:
+1. grösste Abweichungen von den Benchmarks, 2. wo Leerlauf entsteht (konkrete Dienste
+und Zeiten), 3. eine umsetzbare Massnahme. Erfinde keine Zahlen, nutze nur die Daten.
+Antworte ausschliesslich mit einer JSON-Liste von {n} Strings in derselben Reihenfolge.
+
+{summaries}"""
+
+
+def _canonical(summary: dict) -> str:
+    return json.dumps(summary, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+
+
+# ── backends ─────────────────────────────────────────────
+class StubBackend:
+    """Offline backend: fills a fixed template from the summary. Same input, same text."""
+    name = "stub"
+
+    def generate(self, summaries: list) -> list:
+        return [self._text(s) for s in summaries]
+
+    @staticmethod
+    def _text(s: dict) -> str:
+        scope = " · ".join(str(s[k]) for k in ("site", "sector", "day") if s.get(k))
+        misses = [b for b in s.get("benchmarks", []) if b.get("status") == "verfehlt"]
+        parts = [f"{scope}: {len(misses)} von {len(s.get('benchmarks', []))} Benchmark-Kennzahlen verfehlen das Ziel"
+                 + (": " + "; ".join(f"{b['kpi']} {b['value']}{b['unit']} (Ziel {b['target']}{b['unit']})"
+                                      for b in misses[:3]) + "." if misses else ".")]
+        critical = [k["kpi"] for k in s.get("kpis", []) if k.get("trend") == "bad"]
+        if critical:
+            parts.append(f"Kritisch markiert: {', '.join(critical[:5])}" + (" u.a." if len(critical) > 5 else "."))
+        idle = s.get("potenzial", [])
+        if idle:
+            top = idle[0]
+            parts.append(f"Grösster Leerlauf: {top['dienst']} {top['von']}–{top['bis']} ({top['min']:.0f} Min, "
+                         f"{top['task']}); insgesamt {s.get('potenzial_min', 0):.0f} Min Potenzial.")
+            parts.append(f"Massnahme: Leerlaufblock von {top['dienst']} mit Vorbereitung für die nächste Spitze füllen "
+                         f"oder den Dienst um {top['min']:.0f} Min kürzen.")
+        return " ".join(parts)
+
+
+class GeminiBackend:
+    """google-generativeai; imported on first use so the dashboard starts without it."""
+    name = "gemini"
+
+    def __init__(self, model: str = NARRATIVE_MODEL, api_key: str = None):
+        self.model_name = model
+        self._api_key = api_key or os.environ.get("GOOGLE_API_KEY")
+        self._model = None
+
+    def _client(self):
+        if self._model is None:
+            try:
+                import google.generativeai as genai
+            except ImportError as exc:
+                raise ImportError("KI-Kommentare benötigen google-generativeai (pip install google-generativeai).") from exc
+            if not self._api_key:
+                raise RuntimeError("GOOGLE_API_KEY ist nicht gesetzt.")
+            genai.configure(api_key=self._api_key)
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def generate(self, summaries: list) -> list:
+        prompt = PROMPT.format(n=len(summaries), summaries="[" + ",\n".join(map(_canonical, summaries)) + "]")
+        response = self._client().generate_content(
+            prompt, generation_config={"response_mime_type": "application/json", "temperature": 0.2})
+        texts = json.loads(response.text)
+        if not isinstance(texts, list) or len(texts) != len(summaries):
+            if len(summaries) > 1:      # model merged or dropped entries: fall back to one per request
+                return [self.generate([s])[0] for s in summaries]
+            raise ValueError("Unerwartete Antwort des Modells.")
+        return [str(t) for t in texts]
+
+
+BACKENDS = {"stub": StubBackend, "gemini": GeminiBackend}
+
+
+def get_backend(name: str = None):
+    name = (name or os.environ.get(NARRATIVE_BACKEND_ENV) or "stub").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unbekanntes KI-Backend: {name!r} ({'|'.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+# ── client ───────────────────────────────────────────────
+class NarrativeClient:
+    """Content-hash cache and batching in front of a backend; thread-safe."""
+
+    def __init__(self, backend=None, batch_size: int = NARRATIVE_BATCH_SIZE,
+                 cache_dir: str = None, cache_size: int = NARRATIVE_CACHE_SIZE):
+        self.backend = backend or get_backend()
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir if cache_dir is not None else os.environ.get(NARRATIVE_CACHE_ENV)
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.requests = 0
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, summary: dict) -> str:
+        tag = f"{self.backend.name}:{getattr(self.backend, 'model_name', '')}:{PROMPT_VERSION}:"
+        return hashlib.sha256((tag + _canonical(summary)).encode("utf-8")).hexdigest()[:32]
+
+    def _lookup(self, key: str):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as fh:
+                    text = json.load(fh)["text"]
+                self._store(key, text, disk=False)
+                return text
+        return None
+
+    def _store(self, key: str, text: str, disk: bool = True):
+        with self._lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        if disk and self.cache_dir:
+            with open(os.path.join(self.cache_dir, f"{key}.json"), "w", encoding="utf-8") as fh:
+                json.dump({"text": text}, fh, ensure_ascii=False)
+
+    def narrate(self, summary: dict) -> str:
+        return self.narrate_many([summary])[0]
+
+    def narrate_many(self, summaries: list) -> list:
+        """One text per summary; only uncached, distinct summaries reach the backend."""
+        keys = [self.key(s) for s in summaries]
+        texts = {k: self._lookup(k) for k in dict.fromkeys(keys)}
+        missing = [k for k, t in texts.items() if t is None]
+        by_key = dict(zip(keys, summaries))
+        for i in range(0, len(missing), self.batch_size):
+            batch = missing[i:i + self.batch_size]
+            self.requests += 1
+            for k, text in zip(batch, self.backend.generate([by_key[k] for k in batch])):
+                self._store(k, text)
+                texts[k] = text
+        return [texts[k] for k in keys]
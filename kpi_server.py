@@ -0,0 +1,221 @@
+"""Local HTTP/JSON API over the KPI engine in app.py.
+
+    python kpi_server.py --port 8502
+
+    GET /health
+    GET /sites                                   -> available site/day partitions
+    GET /kpis/<kitchen|gastro|total>?mode=time|money&site=default&day=2026-01-01
+    GET /load-curve/<kitchen|gastro|total>?freq=15min&site=default&day=2026-01-01
+    GET /energy-curve/<kitchen|gastro|total>?freq=15min&site=default&day=2026-01-01
+
+Responses are cached per data version and carry an ETag; clients polling with
+If-None-Match get a 304 as long as the roster is unchanged. Concurrent requests
+for the same resource wait on a single computation.
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+import app
+
+DATA_REFRESH_S = 5.0
+MODES = ("time", "money")
+
+
+def data_version(tasks: pd.DataFrame) -> str:
+    """Content hash of the raw roster columns; changes whenever a task changes."""
+    cols = [c for c in ("Dienst", "Start", "Ende", "Task", "Typ", "Sector") if c in tasks.columns]
+    digest = pd.util.hash_pandas_object(tasks[cols], index=False).to_numpy()
+    return hashlib.sha1(digest.tobytes()).hexdigest()[:16]
+
+
+class NotFound(Exception):
+    pass
+
+
+class KPIService:
+    """Partition snapshot, response cache and request coalescing for the HTTP handler."""
+
+    def __init__(self, partitions=app.default_partitions, refresh_s: float = DATA_REFRESH_S):
+        self._partitions = partitions
+        self._refresh_s = refresh_s
+        self._lock = threading.Lock()
+        self._data = {}
+        self._version = None
+        self._loaded_at = 0.0
+        self._cache = {}
+        self._inflight = {}
+
+    # ── data snapshot ────────────────────────────────────
+    def _snapshot(self):
+        with self._lock:
+            if time.monotonic() - self._loaded_at < self._refresh_s:
+                return self._data, self._version
+        data = {(site, str(pd.Timestamp(day).date())): app.DataWarehouse.for_site(tasks, site)
+                for site, day, tasks in self._partitions()}
+        version = hashlib.sha1("".join(
+            f"{site}/{day}:{data_version(tasks)}" for (site, day), tasks in sorted(data.items())
+        ).encode()).hexdigest()[:16]
+        with self._lock:
+            if version != self._version:
+                self._cache.clear()
+            self._data, self._version, self._loaded_at = data, version, time.monotonic()
+        return data, version
+
+    def _tasks(self, data: dict, site: str, day: str, sector: str) -> tuple:
+        if sector not in app.EXPORT_SECTORS:
+            raise NotFound(f"Unbekannter Bereich: {sector}")
+        if day is None:
+            days = sorted(d for s, d in data if s == site)
+            day = days[-1] if days else None
+        tasks = data.get((site, day))
+        if tasks is None:
+            raise NotFound(f"Keine Daten für {site}/{day}")
+        return tasks if sector == "total" else tasks[tasks["Sector"] == sector], day
+
+    # ── cache + coalescing ───────────────────────────────
+    def get(self, key: tuple, compute) -> tuple:
+        """(etag, body) for `key`; the first caller computes, concurrent callers wait on it."""
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                return hit
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[key] = Future()
+        if not owner:
+            return fut.result()
+        try:
+            body = json.dumps(compute(), ensure_ascii=False).encode("utf-8")
+            result = ('"' + hashlib.sha1(body).hexdigest()[:20] + '"', body)
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[key]
+            fut.set_exception(exc)
+            raise
+        with self._lock:
+            self._cache[key] = result
+            del self._inflight[key]
+        fut.set_result(result)
+        return result
+
+    # ── endpoints ────────────────────────────────────────
+    def sites(self) -> tuple:
+        data, version = self._snapshot()
+        return self.get((version, "sites"), lambda: {
+            "data_version": version,
+            "partitions": [{"site": s, "day": d} for s, d in sorted(data)],
+        })
+
+    def kpis(self, sector: str, mode: str, site: str, day: str) -> tuple:
+        if mode not in MODES:
+            raise ValueError(f"Unbekannter Modus: {mode}")
+        data, version = self._snapshot()
+        df, day = self._tasks(data, site, day, sector)
+
+        def compute():
+            kpis = app.EXPORT_SECTORS[sector](df, mode, app.DataWarehouse._derive_shifts(df),
+                                              meals=app.frame_meals(df, site),
+                                              **app.site_kpi_args(sector, data[(site, day)]))
+            return {
+                "site": site, "day": day, "sector": sector, "mode": mode, "data_version": version,
+                "kpis": [{"kpi": title, "val": d.get("val"), "sub": d.get("sub"), "trend": d.get("trend")}
+                         for title, d in kpis],
+            }
+        return self.get((version, "kpis", sector, mode, site, day), compute)
+
+    def load_curve(self, sector: str, freq: str, site: str, day: str) -> tuple:
+        data, version = self._snapshot()
+        df, day = self._tasks(data, site, day, sector)
+
+        def compute():
+            wl_df = app.get_load_curve(df, None if sector == "total" else sector, freq=freq,
+                                       meals=app.frame_meals(df, site))
+            return {
+                "site": site, "day": day, "sector": sector, "freq": freq, "data_version": version,
+                "columns": list(wl_df.columns),
+                "rows": wl_df.to_numpy().tolist(),
+            }
+        return self.get((version, "load-curve", sector, freq, site, day), compute)
+
+    def energy_curve(self, sector: str, freq: str, site: str, day: str) -> tuple:
+        data, version = self._snapshot()
+        df, day = self._tasks(data, site, day, sector)
+
+        def compute():
+            curve = app.get_energy_curve(df, freq=freq)
+            return {
+                "site": site, "day": day, "sector": sector, "freq": freq, "data_version": version,
+                "columns": list(curve.columns),
+                "rows": curve.to_numpy().tolist(),
+            }
+        return self.get((version, "energy-curve", sector, freq, site, day), compute)
+
+
+class KPIRequestHandler(BaseHTTPRequestHandler):
+    service: KPIService = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        site, day = q.get("site", "default"), q.get("day")
+        try:
+            if parts == ["health"]:
+                return self._send(200, b'{"status":"ok"}')
+            if parts == ["sites"]:
+                etag, body = self.service.sites()
+            elif len(parts) == 2 and parts[0] == "kpis":
+                etag, body = self.service.kpis(parts[1], q.get("mode", "time"), site, day)
+            elif len(parts) == 2 and parts[0] == "load-curve":
+                etag, body = self.service.load_curve(parts[1], q.get("freq", app.LOAD_CURVE_FREQ), site, day)
+            elif len(parts) == 2 and parts[0] == "energy-curve":
+                etag, body = self.service.energy_curve(parts[1], q.get("freq", app.LOAD_CURVE_FREQ), site, day)
+            else:
+                raise NotFound(url.path)
+        except NotFound as exc:
+            return self._send(404, json.dumps({"error": str(exc)}, ensure_ascii=False).encode("utf-8"))
+        except ValueError as exc:
+            return self._send(400, json.dumps({"error": str(exc)}, ensure_ascii=False).encode("utf-8"))
+
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            return self._send(304, b"", etag)
+        self._send(200, body, etag)
+
+    def _send(self, status: int, body: bytes, etag: str = None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8502, service: KPIService = None) -> ThreadingHTTPServer:
+    handler = type("Handler", (KPIRequestHandler,), {"service": service or KPIService()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="KPI-API für Wallboards und Schichtplanung")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+    server = serve(args.host, args.port)
+    print(f"KPI-API auf http://{args.host}:{args.port}")
+    server.serve_forever()
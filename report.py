@@ -0,0 +1,259 @@
+"""Static KPI reports per site: self-contained HTML, optionally PDF.
+
+    python report.py --out reports/                                # built-in roster
+    python report.py --out reports/ --demo-sites 40 --days 7 --workers 8
+    python report.py --out reports/ --format pdf                   # needs kaleido + weasyprint
+    python report.py --out reports/ --check-days                   # warn about date-dependent KPIs
+
+One report per site covers all of its days: KPI cards of the latest day, the KPIs of
+every day side by side, the load curve over the whole period, and Gantt plus skill
+match of the latest day. Each site is one task in a process pool. Inside a worker the
+site's frames, shifts, KPIs and load curve are computed once and shared by all sections.
+With --check-days, main() first compares the KPIs of a roster with the same roster on
+other days (day_invariance_diffs) and warns about every card that changes.
+Figures come from the dashboard's build_* helpers and style_plotly_figure, so the
+report looks like the UI. HTML reports inline plotly.js and work offline.
+"""
+import argparse
+import base64
+import functools
+import html
+import sys
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import app
+
+REPORT_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+REPORT_FORMATS = ("html", "pdf")
+FIGURE_CONFIG = {"displayModeBar": False, "responsive": True}
+WEEKDAYS = ("Mo", "Di", "Mi", "Do", "Fr", "Sa", "So")
+DAY_CHECK_OFFSETS = (7, 364)   # whole weeks, so weekend premiums compare like with like
+
+REPORT_CSS = """
+<style>
+    body { max-width: 1400px; margin: 0 auto; padding: 24px 32px; }
+    .kpi-grid { display: grid; grid-template-columns: repeat(5, 1fr); gap: 12px; }
+    .report-figure { break-inside: avoid; margin-bottom: 8px; }
+    table.kpi-week { border-collapse: collapse; font-size: 0.78rem; width: 100%; }
+    table.kpi-week th, table.kpi-week td { border-bottom: 1px solid #E2E8F0; padding: 4px 8px; text-align: right; }
+    table.kpi-week th:first-child, table.kpi-week td:first-child { text-align: left; }
+    @page { size: A4 landscape; margin: 12mm; }
+</style>
+"""
+
+
+def _require_pdf():
+    try:
+        import kaleido  # noqa: F401  (static figure export for plotly)
+        import weasyprint
+    except ImportError as exc:
+        raise ImportError("PDF-Berichte benötigen kaleido und weasyprint (pip install kaleido weasyprint).") from exc
+    return weasyprint
+
+
+@functools.lru_cache(maxsize=2)
+def _plotly_script(plotlyjs: str) -> str:
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+    if plotlyjs == "inline":
+        return f"<script>{get_plotlyjs()}</script>"
+    return f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+
+
+# ── data ─────────────────────────────────────────────────
+def sites_from_partitions(partitions) -> dict:
+    """{site: [(day, tasks), …] in day order} from (site, day, tasks) partitions."""
+    sites = {}
+    for site, day, tasks in partitions:
+        sites.setdefault(site, []).append((str(pd.Timestamp(day).date()), tasks))
+    return {site: sorted(days, key=lambda d: d[0]) for site, days in sites.items()}
+
+
+def demo_partitions(n_sites: int, n_days: int):
+    """The built-in roster cloned to `n_sites` sites × `n_days` consecutive days."""
+    base = app.DataWarehouse.get_combined_data()
+    first = pd.Timestamp(app.ROSTER_DAY)
+    for i in range(n_sites):
+        for d in range(n_days):
+            yield f"site-{i + 1:02d}", str((first + pd.Timedelta(days=d)).date()), shift_days(base, d)
+
+
+def shift_days(tasks: pd.DataFrame, days: int) -> pd.DataFrame:
+    """The same roster `days` calendar days later, costed at the rates valid on the new days."""
+    tasks = tasks.copy()
+    tasks["Start_DT"] += pd.Timedelta(days=days)
+    tasks["End_DT"] += pd.Timedelta(days=days)
+    tasks["Hourly_Rate"] = app.COST_MODEL.hourly_rates(tasks)
+    tasks["Cost_CHF"] = app.COST_MODEL.task_costs(tasks)
+    return tasks
+
+
+# ── checks ───────────────────────────────────────────────
+def day_invariance_diffs(tasks: pd.DataFrame, sector: str = "total", mode: str = "time",
+                         offsets: tuple = DAY_CHECK_OFFSETS) -> pd.DataFrame:
+    """KPI cards of `tasks` against the identical roster moved by each of `offsets` days;
+    one row per card that changes. Rows are expected where the KPIs legitimately depend on
+    the date (a site version with valid_from inside the offsets, holiday premiums); anything
+    else means the engine still pins a calendar day somewhere."""
+    calculate = app.EXPORT_SECTORS[sector]
+
+    def cards(site: pd.DataFrame) -> dict:
+        df = site if sector == "total" else site[site["Sector"] == sector]
+        return dict(calculate(df, mode, app.DataWarehouse._derive_shifts(df), meals=app.frame_meals(df),
+                              **app.site_kpi_args(sector, site)))
+
+    base = cards(tasks)
+    rows = []
+    for offset in offsets:
+        moved = cards(shift_days(tasks, offset))
+        rows += [{"Versatz": offset, "KPI": title, "Wert": data.get("val"), "Wert verschoben": moved.get(title, {}).get("val"),
+                  "Zeile": data.get("sub"), "Zeile verschoben": moved.get(title, {}).get("sub")}
+                 for title, data in base.items() if moved.get(title) != data]
+    return pd.DataFrame(rows, columns=["Versatz", "KPI", "Wert", "Wert verschoben", "Zeile", "Zeile verschoben"])
+
+
+def _site_context(site: str, days: list, sector: str, mode: str) -> dict:
+    """Everything the sections need, computed once per site (with the site's settings)."""
+    calculate = app.EXPORT_SECTORS[sector]
+    frames, kpis = {}, {}
+    for day, tasks in days:
+        tasks = app.DataWarehouse.for_site(tasks, site)
+        df = tasks if sector == "total" else tasks[tasks["Sector"] == sector]
+        frames[day] = df
+        kpis[day] = calculate(df, mode, app.DataWarehouse._derive_shifts(df), meals=app.frame_meals(df),
+                              **app.site_kpi_args(sector, tasks))
+    period = pd.concat(frames.values(), ignore_index=True)
+    first, last = min(frames), max(frames)
+    wl_df = app.get_load_curve(
+        period, None if sector == "total" else sector,
+        start=f"{first} {app.LOAD_CURVE_START}", end=f"{last} {app.LOAD_CURVE_END}",
+        meals=app.frame_meals(period),
+    )
+    return {"frames": frames, "kpis": kpis, "load": app.downsample_load_curve(wl_df),
+            "first": first, "last": last}
+
+
+# ── sections ─────────────────────────────────────────────
+def _figure_html(fig, fmt: str) -> str:
+    if fmt == "pdf":
+        svg = fig.to_image(format="svg")
+        return f'<img class="report-figure" src="data:image/svg+xml;base64,{base64.b64encode(svg).decode()}"/>'
+    return f'<div class="report-figure">{fig.to_html(full_html=False, include_plotlyjs=False, config=FIGURE_CONFIG)}</div>'
+
+
+def _kpi_week_table(kpis: dict) -> str:
+    label = lambda day: f"{WEEKDAYS[pd.Timestamp(day).weekday()]} {pd.Timestamp(day):%d.%m.}"
+    table = pd.DataFrame({label(day): {t: d.get("val") for t, d in values} for day, values in kpis.items()})
+    return table.to_html(classes="kpi-week", border=0, escape=True)
+
+
+def _sections(ctx: dict, sector: str, fmt: str) -> list:
+    last = ctx["last"]
+    df_last = ctx["frames"][last]
+    order = {"kitchen": app.CHART_ORDER_K, "gastro": app.CHART_ORDER_G}.get(sector)
+    if sector == "total":
+        fig_load = app.build_total_load_figure(ctx["load"])
+    else:
+        fig_load = app.render_load_curve(ctx["load"], {"kitchen": "Küche", "gastro": "Gastro"}[sector])
+    cards = "".join(app.kpi_card_html(title, data) for title, data in ctx["kpis"][last])
+    return [
+        (f"Kennzahlen {last}", f'<div class="kpi-grid">{cards}</div>'),
+        (f"Kennzahlen {ctx['first']} – {last}", _kpi_week_table(ctx["kpis"])),
+        ("Belastung (Capacity vs. Demand)", _figure_html(fig_load, fmt)),
+        (f"Gantt-Flow {last}", _figure_html(app.build_gantt_figure(df_last, order, 700 if sector == "total" else 550), fmt)),
+        (f"Skill-Match {last}", _figure_html(app.build_skill_match_figure(df_last, order), fmt)),
+    ]
+
+
+def _document(site: str, ctx: dict, sections: list, fmt: str, plotlyjs: str) -> str:
+    script = _plotly_script(plotlyjs) if fmt == "html" else ""
+    body = "".join(
+        f'<div style="height:1.8rem;"></div><div class="section-label">{html.escape(title)}</div>{content}'
+        for title, content in sections
+    )
+    return f"""<!DOCTYPE html>
+<html lang="de"><head><meta charset="utf-8"><title>Betriebsbericht {html.escape(site)}</title>
+{app._page_css()}{REPORT_CSS}{script}</head>
+<body>
+<div class="dash-header">
+    <div>
+        <div class="dash-title">BETRIEBSBERICHT: {html.escape(site.upper())}</div>
+        <div class="dash-sub">{ctx['first']} – {ctx['last']} · {len(ctx['frames'])} Betriebstag(e)</div>
+    </div>
+    <div class="dash-badge">Erstellt {pd.Timestamp.now():%d.%m.%Y %H:%M}</div>
+</div>
+{body}
+</body></html>"""
+
+
+# ── rendering ────────────────────────────────────────────
+def render_site_report(site: str, days: list, out_dir: str, fmt: str = "html", sector: str = "total",
+                       mode: str = "time", plotlyjs: str = "inline") -> tuple:
+    """Write one site's report; returns (path, seconds). Runs inside a pool worker."""
+    t = time.perf_counter()
+    ctx = _site_context(site, days, sector, mode)
+    doc = _document(site, ctx, _sections(ctx, sector, fmt), fmt, plotlyjs)
+    path = os.path.join(out_dir, f"bericht_{site}_{ctx['last']}.{fmt}")
+    if fmt == "pdf":
+        _require_pdf().HTML(string=doc).write_pdf(path)
+    else:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(doc)
+    return path, time.perf_counter() - t
+
+
+def render_reports(partitions, out_dir: str, fmt: str = "html", workers: int = REPORT_WORKERS,
+                   sector: str = "total", mode: str = "time", plotlyjs: str = "inline") -> dict:
+    """One report per site, rendered in a process pool. Returns {site: path}."""
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unbekanntes Berichtsformat: {fmt!r} (html|pdf)")
+    if fmt == "pdf":
+        _require_pdf()
+    os.makedirs(out_dir, exist_ok=True)
+    sites = sites_from_partitions(partitions)
+    paths = {}
+    if workers <= 1:
+        for site, days in sites.items():
+            paths[site], _ = render_site_report(site, days, out_dir, fmt, sector, mode, plotlyjs)
+        return paths
+    # spawn: workers import app once and never inherit the parent's threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {pool.submit(render_site_report, site, days, out_dir, fmt, sector, mode, plotlyjs): site
+                   for site, days in sites.items()}
+        for fut in as_completed(futures):
+            paths[futures[fut]], _ = fut.result()
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statische Betriebsberichte je Standort erzeugen")
+    parser.add_argument("--out", default="reports")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="html")
+    parser.add_argument("--sector", choices=list(app.EXPORT_SECTORS), default="total")
+    parser.add_argument("--mode", choices=("time", "money"), default="time")
+    parser.add_argument("--workers", type=int, default=REPORT_WORKERS)
+    parser.add_argument("--plotlyjs", choices=("inline", "cdn"), default="inline",
+                        help="inline = offline lesbar (~4.6 MB je Bericht), cdn = klein, braucht Internet")
+    parser.add_argument("--demo-sites", type=int, default=0, help="Basis-Dienstplan auf N Standorte klonen")
+    parser.add_argument("--days", type=int, default=7, help="Tage je Demo-Standort")
+    parser.add_argument("--check-days", action="store_true",
+                        help="vorab warnen, wenn Kennzahlen vom Kalendertag abhängen")
+    args = parser.parse_args()
+
+    partitions = list(demo_partitions(args.demo_sites, args.days) if args.demo_sites else app.default_partitions())
+    if args.check_days and partitions:
+        diffs = day_invariance_diffs(partitions[0][2], args.sector, args.mode)
+        if not diffs.empty:
+            print(f"Warnung: {len(diffs)} Kennzahl(en) ändern sich mit dem Kalendertag "
+                  f"(datierte Standort-Versionen oder Feiertage?):\n{diffs.to_string(index=False)}", file=sys.stderr)
+    t = time.perf_counter()
+    paths = render_reports(partitions, args.out, args.format, args.workers, args.sector, args.mode, args.plotlyjs)
+    print(f"{len(paths)} Bericht(e) in {time.perf_counter() - t:.1f} s → {os.path.abspath(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
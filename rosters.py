@@ -0,0 +1,318 @@
+"""Raw task rosters for the reference day (Küche / Gastrodienste).
+
+Kept out of app.py so the Streamlit script stays small; DataWarehouse loads
+them on first use into a TaskStore.
+"""
+
+KITCHEN_TASKS = [
+    {"Dienst":"D1","Start":"08:00","Ende":"08:25","Task":"Admin: E-Mails/Mutationen/Diätpläne","Typ":"Admin"},
+    {"Dienst":"D1","Start":"08:25","Ende":"08:30","Task":"Hygiene/Rüsten: Wechsel Büro-Küche","Typ":"Logistik"},
+    {"Dienst":"D1","Start":"08:30","Ende":"09:15","Task":"Prod: Suppen (Basis/Convenience 520 Port.)","Typ":"Prod"},
+    {"Dienst":"D1","Start":"09:15","Ende":"09:45","Task":"Prod: ET (System-Ableitung/Allergene)","Typ":"Prod"},
+    {"Dienst":"D1","Start":"09:45","Ende":"10:00","Task":"Admin: 2. Mail-Check (Spätmeldungen)","Typ":"Admin"},
+    {"Dienst":"D1","Start":"10:15","Ende":"10:45","Task":"Prod: Regenerieren Cg-Komp. (High-Convenience)","Typ":"Prod"},
+    {"Dienst":"D1","Start":"10:45","Ende":"11:00","Task":"Coord: Instruktion Band-MA/Spezialessen","Typ":"Coord"},
+    {"Dienst":"D1","Start":"11:00","Ende":"11:20","Task":"Admin: Letzte Orgacard-Updates","Typ":"Admin"},
+    {"Dienst":"D1","Start":"11:20","Ende":"12:20","Task":"Service: Diät-Band (System-Ausgabe)","Typ":"Service"},
+    {"Dienst":"D1","Start":"12:20","Ende":"12:45","Task":"Logistik: Abräumen/Kühlen/Rückstellproben","Typ":"Logistik"},
+    {"Dienst":"D1","Start":"14:30","Ende":"15:00","Task":"Admin: Produktionsprotokolle Folgetag","Typ":"Admin"},
+    {"Dienst":"D1","Start":"15:00","Ende":"15:50","Task":"Prod: MEP Folgetag (Vegi-Komponenten/Fertig)","Typ":"Prod"},
+    {"Dienst":"D1","Start":"15:50","Ende":"16:30","Task":"Prod: Abend Diät-Komp. (Regenerieren/Garen)","Typ":"Prod"},
+    {"Dienst":"D1","Start":"16:30","Ende":"17:00","Task":"Coord: Tablettkarten/Service-Setup","Typ":"Coord"},
+    {"Dienst":"D1","Start":"17:00","Ende":"18:05","Task":"Service: Band-Abendessen","Typ":"Service"},
+    {"Dienst":"D1","Start":"18:05","Ende":"18:09","Task":"Logistik: Aufräumen/To-Do Liste","Typ":"Logistik"},
+    {"Dienst":"E1","Start":"07:00","Ende":"07:15","Task":"Coord: Posten einrichten","Typ":"Coord"},
+    {"Dienst":"E1","Start":"07:15","Ende":"08:30","Task":"Prod: Stärke (Dämpfen/Convenience 520 Pax)","Typ":"Prod"},
+    {"Dienst":"E1","Start":"08:30","Ende":"09:30","Task":"Prod: Gemüse (Dämpfen/Regenerieren 520 Pax)","Typ":"Prod"},
+    {"Dienst":"E1","Start":"09:30","Ende":"09:45","Task":"Prod: Suppe Finalisieren (Basis)","Typ":"Prod"},
+    {"Dienst":"E1","Start":"09:45","Ende":"10:00","Task":"Logistik: Bereitstellung Gastro","Typ":"Logistik"},
+    {"Dienst":"E1","Start":"10:15","Ende":"10:45","Task":"Prod: Wahlkost Spezial (System/Minute)","Typ":"Prod"},
+    {"Dienst":"E1","Start":"10:45","Ende":"11:20","Task":"Prod: Regenerieren Band (High-Convenience)","Typ":"Prod"},
+    {"Dienst":"E1","Start":"11:20","Ende":"12:30","Task":"Potenzial: 70-Min-Falle (Bereitschaft/Warten)","Typ":"Potenzial"},
+    {"Dienst":"E1","Start":"12:30","Ende":"12:45","Task":"Logistik: Transport Reste Restaurant","Typ":"Logistik"},
+    {"Dienst":"E1","Start":"12:45","Ende":"13:00","Task":"Logistik: Reinigung Clean-as-you-go","Typ":"Logistik"},
+    {"Dienst":"E1","Start":"13:30","Ende":"14:00","Task":"Prod: Wahlkost MEP Abend/Morgen (Vorbereitung)","Typ":"Prod"},
+    {"Dienst":"E1","Start":"14:00","Ende":"15:00","Task":"Prod: MEP Folgetag (Großmenge/Schnittware)","Typ":"Prod"},
+    {"Dienst":"E1","Start":"15:00","Ende":"15:30","Task":"Admin/QC: Kühlhäuser/MHDs/Ordnung","Typ":"Admin"},
+    {"Dienst":"E1","Start":"15:30","Ende":"15:54","Task":"Logistik: Endreinigung Posten/Unterschriften","Typ":"Logistik"},
+    {"Dienst":"S1","Start":"07:00","Ende":"07:30","Task":"Prod: Saucen/Basis (Päckli/Convenience)","Typ":"Prod"},
+    {"Dienst":"S1","Start":"07:30","Ende":"08:30","Task":"Prod: Fleisch Finish (Kurzbraten/System)","Typ":"Prod"},
+    {"Dienst":"S1","Start":"08:30","Ende":"09:30","Task":"Coord: Support E1 (Pufferzeit)","Typ":"Coord"},
+    {"Dienst":"S1","Start":"09:30","Ende":"10:00","Task":"Prod: Wahlkost Finish (Montage)","Typ":"Prod"},
+    {"Dienst":"S1","Start":"10:15","Ende":"10:45","Task":"Prod: Regenerieren Fleisch/Sauce/Wärmewägen","Typ":"Prod"},
+    {"Dienst":"S1","Start":"10:45","Ende":"11:00","Task":"Logistik: Wagenübergabe Gastro","Typ":"Logistik"},
+    {"Dienst":"S1","Start":"11:00","Ende":"11:20","Task":"Prod: Wahlkost Setup (Montage)","Typ":"Prod"},
+    {"Dienst":"S1","Start":"11:20","Ende":"12:30","Task":"Potenzial: Wahlkost-Idle (Warten auf Bons)","Typ":"Potenzial"},
+    {"Dienst":"S1","Start":"12:30","Ende":"12:45","Task":"Logistik: Nachschub Restaurant","Typ":"Logistik"},
+    {"Dienst":"S1","Start":"12:45","Ende":"13:00","Task":"Logistik: Reinigung Kipper","Typ":"Logistik"},
+    {"Dienst":"S1","Start":"13:30","Ende":"14:15","Task":"Admin: Produktionspläne/TK-Management","Typ":"Admin"},
+    {"Dienst":"S1","Start":"14:15","Ende":"15:00","Task":"Prod: MEP Folgetag (Fleisch marinieren/Batch)","Typ":"Prod"},
+    {"Dienst":"S1","Start":"15:00","Ende":"15:30","Task":"Admin/QC: Kühlhäuser/Temperaturen/MHDs","Typ":"Admin"},
+    {"Dienst":"S1","Start":"15:30","Ende":"15:54","Task":"Logistik: Endreinigung Posten/Unterschriften","Typ":"Logistik"},
+    {"Dienst":"R1","Start":"06:30","Ende":"07:15","Task":"Logistik: Warenannahme Rampe (HACCP Risiko)","Typ":"Logistik"},
+    {"Dienst":"R1","Start":"07:15","Ende":"07:30","Task":"Logistik: Verräumen Kühlhaus","Typ":"Logistik"},
+    {"Dienst":"R1","Start":"07:30","Ende":"07:45","Task":"Potenzial: Hygiene-Schleuse/Umziehen","Typ":"Potenzial"},
+    {"Dienst":"R1","Start":"07:45","Ende":"08:30","Task":"Admin: Manuelle Deklaration/Intranet","Typ":"Admin"},
+    {"Dienst":"R1","Start":"08:30","Ende":"09:30","Task":"Prod: MEP Folgetag (Freeflow/Montage)","Typ":"Prod"},
+    {"Dienst":"R1","Start":"09:30","Ende":"10:00","Task":"Service: Setup Heute (Verbrauchsmaterial)","Typ":"Service"},
+    {"Dienst":"R1","Start":"10:20","Ende":"10:45","Task":"Logistik: Transport Speisen (von G2/H2)","Typ":"Logistik"},
+    {"Dienst":"R1","Start":"10:45","Ende":"11:00","Task":"Service: Einsetzen Buffet/Suppe","Typ":"Service"},
+    {"Dienst":"R1","Start":"11:00","Ende":"11:15","Task":"Coord: Quality Check/Showteller/Foto","Typ":"Coord"},
+    {"Dienst":"R1","Start":"11:15","Ende":"11:30","Task":"Potenzial: Bereitschaft","Typ":"Potenzial"},
+    {"Dienst":"R1","Start":"11:30","Ende":"13:30","Task":"Service: Mittagsservice Gastro","Typ":"Service"},
+    {"Dienst":"R1","Start":"13:30","Ende":"14:00","Task":"Logistik: Abbau Buffet/Entsorgen","Typ":"Logistik"},
+    {"Dienst":"R1","Start":"14:30","Ende":"15:00","Task":"Logistik: Bestellungen für Folgetag/MEP","Typ":"Logistik"},
+    {"Dienst":"R1","Start":"15:00","Ende":"15:24","Task":"Logistik: Endreinigung/Temp-Liste","Typ":"Logistik"},
+    {"Dienst":"R2","Start":"06:30","Ende":"06:50","Task":"Service: Band-Setup (Patienten/Butter)","Typ":"Service"},
+    {"Dienst":"R2","Start":"06:50","Ende":"07:45","Task":"Service: Band-Service (Falsche Zuordnung)","Typ":"Service"},
+    {"Dienst":"R2","Start":"07:45","Ende":"08:00","Task":"Logistik: Wechsel Patient->Gastro","Typ":"Logistik"},
+    {"Dienst":"R2","Start":"08:00","Ende":"08:30","Task":"Potenzial: Salat-Finish (Gedehnt 12 Stk)","Typ":"Potenzial"},
+    {"Dienst":"R2","Start":"08:30","Ende":"09:00","Task":"Logistik: Office/Abfall (Botengänge)","Typ":"Logistik"},
+    {"Dienst":"R2","Start":"09:00","Ende":"09:30","Task":"Logistik: Geräte-Check (Muda/Fritteuse)","Typ":"Logistik"},
+    {"Dienst":"R2","Start":"09:30","Ende":"10:00","Task":"Potenzial: Leerlauf/Puffer","Typ":"Potenzial"},
+    {"Dienst":"R2","Start":"10:20","Ende":"10:45","Task":"Logistik: Transport & Fritteuse Start","Typ":"Logistik"},
+    {"Dienst":"R2","Start":"10:45","Ende":"11:00","Task":"Prod: Fritteuse (Pommes blanchieren)","Typ":"Prod"},
+    {"Dienst":"R2","Start":"11:00","Ende":"11:30","Task":"Coord: Show-Setup/Foto (Redundanz)","Typ":"Coord"},
+    {"Dienst":"R2","Start":"11:30","Ende":"13:30","Task":"Service: Mittagsservice & ReCircle","Typ":"Service"},
+    {"Dienst":"R2","Start":"13:30","Ende":"14:00","Task":"Service: Food Rescue (Verkauf)","Typ":"Service"},
+    {"Dienst":"R2","Start":"14:30","Ende":"15:00","Task":"Admin: Etiketten-Druck ReCircle/Deklaration","Typ":"Admin"},
+    {"Dienst":"R2","Start":"15:00","Ende":"15:24","Task":"Logistik: Endreinigung/Bestellungen/Unterschrift","Typ":"Logistik"},
+    {"Dienst":"H1","Start":"05:30","Ende":"06:00","Task":"Prod: Birchermüsli/Brei (Mischen/Convenience)","Typ":"Prod"},
+    {"Dienst":"H1","Start":"06:00","Ende":"06:30","Task":"Prod: Rahm/Dessert Vorb. (Maschine)","Typ":"Prod"},
+    {"Dienst":"H1","Start":"06:30","Ende":"06:50","Task":"Service: Band-Setup","Typ":"Service"},
+    {"Dienst":"H1","Start":"06:50","Ende":"07:45","Task":"Service: Band Frühstück","Typ":"Service"},
+    {"Dienst":"H1","Start":"07:45","Ende":"08:15","Task":"Logistik: Aufräumen/Auffüllen (Butter/Konfi)","Typ":"Logistik"},
+    {"Dienst":"H1","Start":"08:15","Ende":"09:15","Task":"Prod: Dessert/Patisserie (Redundanz H2/Convenience)","Typ":"Prod"},
+    {"Dienst":"H1","Start":"09:15","Ende":"10:00","Task":"Prod: Salat Vorbereitung (Redundanz G2/Beutel)","Typ":"Prod"},
+    {"Dienst":"H1","Start":"10:15","Ende":"10:45","Task":"Prod: Glacé portionieren (System)","Typ":"Prod"},
+    {"Dienst":"H1","Start":"10:45","Ende":"11:25","Task":"Prod: Käse schneiden (Maschine/Fertig)","Typ":"Prod"},
+    {"Dienst":"H1","Start":"11:25","Ende":"12:30","Task":"Service: Band Mittagsservice","Typ":"Service"},
+    {"Dienst":"H1","Start":"12:30","Ende":"12:45","Task":"Logistik: Material versorgen","Typ":"Logistik"},
+    {"Dienst":"H1","Start":"13:30","Ende":"14:00","Task":"Prod: Menüsalat Abend (Vorbereitung)","Typ":"Prod"},
+    {"Dienst":"H1","Start":"14:00","Ende":"14:20","Task":"Admin: Posten-Protokoll Folgetag","Typ":"Admin"},
+    {"Dienst":"H1","Start":"14:20","Ende":"14:40","Task":"Logistik/Admin: Milchfrigor Kontrolle & Bestellung","Typ":"Admin"},
+    {"Dienst":"H2","Start":"09:15","Ende":"09:30","Task":"Prod: Basis-Massen (Convenience/Pulver)","Typ":"Prod"},
+    {"Dienst":"H2","Start":"09:30","Ende":"10:15","Task":"Prod: Restaurant-Finish (Montage 25 Gläser)","Typ":"Prod"},
+    {"Dienst":"H2","Start":"10:15","Ende":"11:00","Task":"Prod: Patienten-Masse (Abfüllen/Convenience)","Typ":"Prod"},
+    {"Dienst":"H2","Start":"11:00","Ende":"11:15","Task":"Logistik: Transport Gastro","Typ":"Logistik"},
+    {"Dienst":"H2","Start":"11:15","Ende":"11:45","Task":"Logistik: Wagen-Bau Abend","Typ":"Logistik"},
+    {"Dienst":"H2","Start":"11:45","Ende":"12:30","Task":"Prod: Power-Dessert (Anrühren/Päckli)","Typ":"Prod"},
+    {"Dienst":"H2","Start":"12:30","Ende":"13:00","Task":"Service: Privat-Zvieri (Transport)","Typ":"Service"},
+    {"Dienst":"H2","Start":"13:00","Ende":"13:30","Task":"Logistik: Puffer/Reinigung","Typ":"Logistik"},
+    {"Dienst":"H2","Start":"14:15","Ende":"15:15","Task":"Prod: Dessert Gastro Folgetag (Abfüllen/System)","Typ":"Prod"},
+    {"Dienst":"H2","Start":"15:15","Ende":"16:00","Task":"Prod: Dessert Pat Folgetag (Abfüllen/System)","Typ":"Prod"},
+    {"Dienst":"H2","Start":"16:00","Ende":"16:30","Task":"Coord: Support H1/Glacé","Typ":"Coord"},
+    {"Dienst":"H2","Start":"16:30","Ende":"17:00","Task":"Service: Setup Abend/Glacé","Typ":"Service"},
+    {"Dienst":"H2","Start":"17:00","Ende":"18:00","Task":"Service: Band Abendessen","Typ":"Service"},
+    {"Dienst":"H2","Start":"18:00","Ende":"18:09","Task":"Logistik: Abschluss/Material","Typ":"Logistik"},
+    {"Dienst":"H3","Start":"09:15","Ende":"09:45","Task":"Prod: Wähen Montage (Convenience/Teig)","Typ":"Prod"},
+    {"Dienst":"H3","Start":"09:45","Ende":"10:30","Task":"Prod: Sandwiches (System-Montage)","Typ":"Prod"},
+    {"Dienst":"H3","Start":"10:30","Ende":"11:15","Task":"Prod: Salatteller (Montage/Beutel)","Typ":"Prod"},
+    {"Dienst":"H3","Start":"11:15","Ende":"12:00","Task":"Prod: Abend Kalt (Platten/Legesystem)","Typ":"Prod"},
+    {"Dienst":"H3","Start":"12:00","Ende":"12:30","Task":"Prod: Bircher-Masse für Morgen (Mischen)","Typ":"Prod"},
+    {"Dienst":"H3","Start":"12:30","Ende":"13:00","Task":"Logistik: Reste/Saucen","Typ":"Logistik"},
+    {"Dienst":"H3","Start":"13:00","Ende":"13:30","Task":"Logistik: Zwischenreinigung","Typ":"Logistik"},
+    {"Dienst":"H3","Start":"14:15","Ende":"15:15","Task":"Prod: Salatbuffet/MEP (System)","Typ":"Prod"},
+    {"Dienst":"H3","Start":"15:15","Ende":"16:00","Task":"Prod: Wähen/Creme Brulee (Vorbereitung)","Typ":"Prod"},
+    {"Dienst":"H3","Start":"16:00","Ende":"16:30","Task":"Coord: Protokolle/Nachproduktion","Typ":"Coord"},
+    {"Dienst":"H3","Start":"16:30","Ende":"17:00","Task":"Service: Setup Band","Typ":"Service"},
+    {"Dienst":"H3","Start":"17:00","Ende":"18:00","Task":"Service: Band Abend Support","Typ":"Service"},
+    {"Dienst":"H3","Start":"18:00","Ende":"18:09","Task":"Logistik: Abschluss Kaltküche","Typ":"Logistik"},
+    {"Dienst":"G2","Start":"09:30","Ende":"09:45","Task":"Coord: Absprache H3","Typ":"Coord"},
+    {"Dienst":"G2","Start":"09:45","Ende":"10:30","Task":"Prod: Wahlkost Kalt (System-Montage)","Typ":"Prod"},
+    {"Dienst":"G2","Start":"10:30","Ende":"11:15","Task":"Prod: Patienten-Salat (Beutel/Convenience)","Typ":"Prod"},
+    {"Dienst":"G2","Start":"11:15","Ende":"12:30","Task":"Prod: Abendessen (Aufschnitt/Montage)","Typ":"Prod"},
+    {"Dienst":"G2","Start":"12:30","Ende":"13:30","Task":"Prod: Salate Folgetag/Zwischenreinigung","Typ":"Prod"},
+    {"Dienst":"G2","Start":"14:15","Ende":"15:00","Task":"Prod: MEP Folgetag (System)","Typ":"Prod"},
+    {"Dienst":"G2","Start":"15:00","Ende":"16:00","Task":"Potenzial: Leerlauf/Dehnung (Standard-Tag)","Typ":"Potenzial"},
+    {"Dienst":"G2","Start":"16:00","Ende":"17:00","Task":"Coord: Band-Setup/Nachproduktion","Typ":"Coord"},
+    {"Dienst":"G2","Start":"17:00","Ende":"18:00","Task":"Service: Band-Abendessen","Typ":"Service"},
+    {"Dienst":"G2","Start":"18:00","Ende":"18:30","Task":"Admin: Hotellerie-Check/To-Do Liste","Typ":"Admin"},
+]
+
+GASTRO_TASKS = [
+    {"Dienst":"K1","Start":"06:45","Ende":"07:00","Task":"Mise en Place: Bain-Marie & Förderband","Typ":"Service-Support"},
+    {"Dienst":"K1","Start":"07:00","Ende":"08:00","Task":"Frühstücksband: Bestückung & Ausgabesupport","Typ":"Service-Support"},
+    {"Dienst":"K1","Start":"08:00","Ende":"08:15","Task":"Vorbereitung Band für Reinigung","Typ":"Service-Support"},
+    {"Dienst":"K1","Start":"08:15","Ende":"08:45","Task":"Speisewagen retour holen","Typ":"Transport"},
+    {"Dienst":"K1","Start":"08:45","Ende":"09:30","Task":"Speisewagen von Stationen retour holen","Typ":"Transport"},
+    {"Dienst":"K1","Start":"09:30","Ende":"10:00","Task":"Recycling: Trennung Wertstoffe aus Rücklauf","Typ":"Logistik"},
+    {"Dienst":"K1","Start":"10:00","Ende":"10:30","Task":"Leergut-Handling & Wäschesäcke sortieren","Typ":"Logistik"},
+    {"Dienst":"K1","Start":"10:30","Ende":"11:20","Task":"Komplette Entsorgung (Bio-Trans, Kehricht)","Typ":"Logistik"},
+    {"Dienst":"K1","Start":"11:20","Ende":"11:30","Task":"Händewaschen & Vorbereitung Mittagsband","Typ":"Reinigung"},
+    {"Dienst":"K1","Start":"11:30","Ende":"12:15","Task":"Mittagsband: Station Suppen schöpfen","Typ":"Service-Support"},
+    {"Dienst":"K1","Start":"12:15","Ende":"12:35","Task":"Komplette Entsorgung nach Service (Bio-Trans)","Typ":"Logistik"},
+    {"Dienst":"K1","Start":"12:35","Ende":"12:40","Task":"Checkout & Übergabe Frühdienst","Typ":"Admin"},
+    {"Dienst":"K1","Start":"15:30","Ende":"15:45","Task":"Check-In & Briefing Spätdienst","Typ":"Admin"},
+    {"Dienst":"K1","Start":"15:45","Ende":"16:15","Task":"Stationsbedarf in Speisewagen einräumen","Typ":"Logistik"},
+    {"Dienst":"K1","Start":"16:15","Ende":"16:45","Task":"Entsorgung Recycling & Wäschesäcke","Typ":"Logistik"},
+    {"Dienst":"K1","Start":"16:45","Ende":"17:05","Task":"Reinigung: Büros, Lavabos & Seifendispenser","Typ":"Reinigung"},
+    {"Dienst":"K1","Start":"17:05","Ende":"18:00","Task":"Abendband: Station Tablett & Karten","Typ":"Service-Support"},
+    {"Dienst":"K1","Start":"18:00","Ende":"18:10","Task":"Reinigung Förderband (Nassreinigung)","Typ":"Reinigung"},
+    {"Dienst":"K1","Start":"18:10","Ende":"18:15","Task":"Frühstücksband Mise en Place für Folgetag","Typ":"Service-Support"},
+    {"Dienst":"K1","Start":"18:15","Ende":"18:20","Task":"Speisewagen ziehen & Parkposition","Typ":"Transport"},
+    {"Dienst":"K2","Start":"06:45","Ende":"08:15","Task":"Spülen: Nachtessen-Rücklauf","Typ":"Spülen"},
+    {"Dienst":"K2","Start":"08:15","Ende":"08:45","Task":"Abwaschküche Speisewagen ausladen","Typ":"Spülen"},
+    {"Dienst":"K2","Start":"08:45","Ende":"09:00","Task":"Reinigung: Casserolier-Posten aufräumen","Typ":"Reinigung"},
+    {"Dienst":"K2","Start":"09:00","Ende":"10:00","Task":"Spülen: Frühstücks-Rücklauf","Typ":"Spülen"},
+    {"Dienst":"K2","Start":"10:00","Ende":"10:15","Task":"Logistik: Abfallentsorgung Abwaschküche","Typ":"Logistik"},
+    {"Dienst":"K2","Start":"10:15","Ende":"11:15","Task":"Reinigung: Nassreinigung aller Kühlräume","Typ":"Reinigung"},
+    {"Dienst":"K2","Start":"11:15","Ende":"11:25","Task":"Hygiene-Switch: Vorbereitung Bandposten","Typ":"Service-Support"},
+    {"Dienst":"K2","Start":"11:25","Ende":"12:20","Task":"Service-Support: Bandposition Tablettaufgabe","Typ":"Service-Support"},
+    {"Dienst":"K2","Start":"12:20","Ende":"12:40","Task":"Logistik: Besteckwagen parkieren","Typ":"Logistik"},
+    {"Dienst":"K2","Start":"12:40","Ende":"13:00","Task":"Spülen: Maschine entladen (Reinseite)","Typ":"Spülen"},
+    {"Dienst":"K2","Start":"13:00","Ende":"13:45","Task":"Abwaschküche Speisewagen ausladen","Typ":"Spülen"},
+    {"Dienst":"K2","Start":"13:45","Ende":"15:30","Task":"Spülen: Mittags-Rücklauf","Typ":"Spülen"},
+    {"Dienst":"K2","Start":"15:30","Ende":"15:50","Task":"Reinigung: Grundreinigung Abwaschküche","Typ":"Reinigung"},
+    {"Dienst":"K2","Start":"15:50","Ende":"16:00","Task":"Logistik: Müllentsorgung","Typ":"Logistik"},
+    {"Dienst":"K2","Start":"16:00","Ende":"16:09","Task":"Admin: Hygienekontrolle visieren","Typ":"Admin"},
+    {"Dienst":"K5","Start":"06:45","Ende":"07:15","Task":"Spülen: Mise en Place Abwaschstrasse","Typ":"Spülen"},
+    {"Dienst":"K5","Start":"07:15","Ende":"08:15","Task":"Logistik: Bio-Trans Betrieb Nachtessen-Wagen","Typ":"Logistik"},
+    {"Dienst":"K5","Start":"08:15","Ende":"08:45","Task":"Abwaschküche Geschirr sortieren","Typ":"Spülen"},
+    {"Dienst":"K5","Start":"08:45","Ende":"09:00","Task":"Reinigung: Manuelle Reinigung Speisewagen","Typ":"Reinigung"},
+    {"Dienst":"K5","Start":"09:00","Ende":"10:15","Task":"Logistik: Bio-Trans Betrieb Frühstücksreste","Typ":"Logistik"},
+    {"Dienst":"K5","Start":"10:15","Ende":"10:45","Task":"Reinigung: Besteckband & Rutschbahn","Typ":"Reinigung"},
+    {"Dienst":"K5","Start":"10:45","Ende":"11:00","Task":"Reinigung: Maschinenpflege","Typ":"Reinigung"},
+    {"Dienst":"K5","Start":"11:00","Ende":"11:15","Task":"Reinigung: Abräumband & Boden","Typ":"Reinigung"},
+    {"Dienst":"K5","Start":"11:15","Ende":"11:25","Task":"Hygiene-Switch: Schürzenwechsel","Typ":"Service-Support"},
+    {"Dienst":"K5","Start":"11:25","Ende":"12:25","Task":"Service-Support: Bandposition Saucen","Typ":"Service-Support"},
+    {"Dienst":"K5","Start":"12:25","Ende":"12:40","Task":"Reinigung: Wärmewagen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K5","Start":"12:40","Ende":"13:00","Task":"Spülen: Unterstützung Abwaschküche","Typ":"Spülen"},
+    {"Dienst":"K5","Start":"13:00","Ende":"13:45","Task":"Abwaschküche Geschirr sortieren","Typ":"Spülen"},
+    {"Dienst":"K5","Start":"13:45","Ende":"15:00","Task":"Logistik: Bio-Trans Betrieb Mittagsreste","Typ":"Logistik"},
+    {"Dienst":"K5","Start":"15:00","Ende":"15:30","Task":"Reinigung: Besteckband & Rutschbahn","Typ":"Reinigung"},
+    {"Dienst":"K5","Start":"15:30","Ende":"15:45","Task":"Reinigung: Abwaschküchen-Boden","Typ":"Reinigung"},
+    {"Dienst":"K5","Start":"15:45","Ende":"16:00","Task":"Reinigung: Reine Zone Boden nass aufnehmen","Typ":"Reinigung"},
+    {"Dienst":"K5","Start":"16:00","Ende":"16:09","Task":"Admin: Checkout","Typ":"Admin"},
+    {"Dienst":"K6","Start":"06:45","Ende":"07:00","Task":"Spülen: Inbetriebnahme Maschine","Typ":"Spülen"},
+    {"Dienst":"K6","Start":"07:00","Ende":"08:15","Task":"Spülen: Geschirreingabe Nachtessen-Wagen","Typ":"Spülen"},
+    {"Dienst":"K6","Start":"08:15","Ende":"08:45","Task":"Abwaschküche Bandautomat bestücken","Typ":"Spülen"},
+    {"Dienst":"K6","Start":"08:45","Ende":"10:15","Task":"Spülen: Geschirreingabe Frühstückswagen","Typ":"Spülen"},
+    {"Dienst":"K6","Start":"10:15","Ende":"10:45","Task":"Reinigung: Maschinen-Innenreinigung","Typ":"Reinigung"},
+    {"Dienst":"K6","Start":"10:45","Ende":"11:00","Task":"Logistik: Abfallentsorgung","Typ":"Logistik"},
+    {"Dienst":"K6","Start":"11:00","Ende":"11:10","Task":"Reinigung: Umfeld Reinigungsoffice","Typ":"Reinigung"},
+    {"Dienst":"K6","Start":"11:10","Ende":"11:20","Task":"Hygiene-Switch: Schürzenwechsel","Typ":"Service-Support"},
+    {"Dienst":"K6","Start":"11:20","Ende":"12:20","Task":"Service-Support: Bandposition Gemüse","Typ":"Service-Support"},
+    {"Dienst":"K6","Start":"12:20","Ende":"12:35","Task":"Reinigung: Wärmewagen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K6","Start":"12:35","Ende":"13:00","Task":"Spülen: Geschirreingabe Restaurant","Typ":"Spülen"},
+    {"Dienst":"K6","Start":"13:00","Ende":"13:45","Task":"Abwaschküche Bandautomat bestücken","Typ":"Spülen"},
+    {"Dienst":"K6","Start":"13:45","Ende":"15:30","Task":"Spülen: Geschirreingabe Mittagessen-Wagen","Typ":"Spülen"},
+    {"Dienst":"K6","Start":"15:30","Ende":"15:45","Task":"Logistik: Entsorgung Abfallsäcke","Typ":"Logistik"},
+    {"Dienst":"K6","Start":"15:45","Ende":"16:00","Task":"Reinigung: Abstellwagen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K6","Start":"16:00","Ende":"16:09","Task":"Logistik: Wäschepool / Admin","Typ":"Logistik"},
+    {"Dienst":"K7","Start":"06:45","Ende":"07:00","Task":"Spülen: Setup Reine Seite","Typ":"Spülen"},
+    {"Dienst":"K7","Start":"07:00","Ende":"08:15","Task":"Spülen: Geschirrentnahme Nachtessen","Typ":"Spülen"},
+    {"Dienst":"K7","Start":"08:15","Ende":"08:45","Task":"Abwaschküche Geschirr abräumen","Typ":"Spülen"},
+    {"Dienst":"K7","Start":"08:45","Ende":"10:15","Task":"Spülen: Geschirrentnahme Frühstück","Typ":"Spülen"},
+    {"Dienst":"K7","Start":"10:15","Ende":"10:45","Task":"Reinigung: Tablett-Maschine","Typ":"Reinigung"},
+    {"Dienst":"K7","Start":"10:45","Ende":"11:00","Task":"Reinigung: Tablett-Stapler","Typ":"Reinigung"},
+    {"Dienst":"K7","Start":"11:00","Ende":"11:20","Task":"Logistik: Wagenbereitstellung","Typ":"Logistik"},
+    {"Dienst":"K7","Start":"11:20","Ende":"11:25","Task":"Hygiene-Switch: Schürzenwechsel","Typ":"Service-Support"},
+    {"Dienst":"K7","Start":"11:25","Ende":"12:20","Task":"Service-Support: Bandposition Fleisch","Typ":"Service-Support"},
+    {"Dienst":"K7","Start":"12:20","Ende":"12:40","Task":"Reinigung: Wärmewagen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K7","Start":"12:40","Ende":"13:00","Task":"Spülen: Unterstützung Reine Seite","Typ":"Spülen"},
+    {"Dienst":"K7","Start":"13:00","Ende":"13:45","Task":"Abwaschküche Geschirr abräumen","Typ":"Spülen"},
+    {"Dienst":"K7","Start":"13:45","Ende":"15:15","Task":"Spülen: Geschirreingabe Mittagessen","Typ":"Spülen"},
+    {"Dienst":"K7","Start":"15:15","Ende":"15:45","Task":"Reinigung: Maschinen-Innenreinigung","Typ":"Reinigung"},
+    {"Dienst":"K7","Start":"15:45","Ende":"16:00","Task":"Logistik: Abfallentsorgung","Typ":"Logistik"},
+    {"Dienst":"K7","Start":"16:00","Ende":"16:09","Task":"Admin: Checkout","Typ":"Admin"},
+    {"Dienst":"K8","Start":"06:45","Ende":"07:00","Task":"Logistik: Verteilung Kaffeekannen","Typ":"Logistik"},
+    {"Dienst":"K8","Start":"07:00","Ende":"08:00","Task":"Service-Support: Bandposition Esskarten","Typ":"Service-Support"},
+    {"Dienst":"K8","Start":"08:00","Ende":"08:15","Task":"Reinigung: Dispenser & Geschirrwagen","Typ":"Reinigung"},
+    {"Dienst":"K8","Start":"08:15","Ende":"08:45","Task":"Abwaschküche Bandautomat bestücken","Typ":"Spülen"},
+    {"Dienst":"K8","Start":"08:45","Ende":"10:00","Task":"Spülen: Entnahme & Verräumen","Typ":"Spülen"},
+    {"Dienst":"K8","Start":"10:00","Ende":"11:00","Task":"Reinigung: Lavabo-Tour (Hygiene)","Typ":"Reinigung"},
+    {"Dienst":"K8","Start":"11:00","Ende":"11:20","Task":"Reinigung: Spezialreinigung","Typ":"Reinigung"},
+    {"Dienst":"K8","Start":"11:20","Ende":"11:30","Task":"Hygiene-Switch: Schürzenwechsel","Typ":"Service-Support"},
+    {"Dienst":"K8","Start":"11:30","Ende":"12:25","Task":"Service-Support: Bandposition Tellerwagen","Typ":"Service-Support"},
+    {"Dienst":"K8","Start":"12:25","Ende":"12:40","Task":"Logistik: Tellerwagen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K8","Start":"12:40","Ende":"13:00","Task":"Service-Support: Unterstützung Casserolier","Typ":"Service-Support"},
+    {"Dienst":"K8","Start":"13:00","Ende":"13:45","Task":"Abwaschküche Bandautomat bestücken","Typ":"Spülen"},
+    {"Dienst":"K8","Start":"13:45","Ende":"15:00","Task":"Spülen: Abwaschmaschine entladen","Typ":"Spülen"},
+    {"Dienst":"K8","Start":"15:00","Ende":"15:45","Task":"Logistik: Verräumen & Wärmewagen","Typ":"Logistik"},
+    {"Dienst":"K8","Start":"15:45","Ende":"16:00","Task":"Service-Support: Mise en Place Abendband","Typ":"Service-Support"},
+    {"Dienst":"K8","Start":"16:00","Ende":"16:09","Task":"Admin: Checkout","Typ":"Admin"},
+    {"Dienst":"K10","Start":"06:45","Ende":"07:30","Task":"Spülen: Entleeren von Flüssigkeiten","Typ":"Spülen"},
+    {"Dienst":"K10","Start":"07:30","Ende":"08:15","Task":"Transport: Speisewagen-Logistik","Typ":"Transport"},
+    {"Dienst":"K10","Start":"08:15","Ende":"08:45","Task":"Abwaschküche Flüssigkeiten leeren","Typ":"Spülen"},
+    {"Dienst":"K10","Start":"08:45","Ende":"10:30","Task":"Service-Support: Besteck einwickeln","Typ":"Service-Support"},
+    {"Dienst":"K10","Start":"10:30","Ende":"11:00","Task":"Logistik: Wäsche-Sortierung","Typ":"Logistik"},
+    {"Dienst":"K10","Start":"11:00","Ende":"11:20","Task":"Reinigung: Arbeitsplatzreinigung","Typ":"Reinigung"},
+    {"Dienst":"K10","Start":"11:20","Ende":"11:25","Task":"Hygiene-Switch: Schürzenwechsel","Typ":"Service-Support"},
+    {"Dienst":"K10","Start":"11:25","Ende":"12:25","Task":"Service-Support: Bandposition Beilagen","Typ":"Service-Support"},
+    {"Dienst":"K10","Start":"12:25","Ende":"12:30","Task":"Reinigung: Boden wischen","Typ":"Reinigung"},
+    {"Dienst":"K10","Start":"13:00","Ende":"13:45","Task":"Abwaschküche Flüssigkeiten leeren","Typ":"Spülen"},
+    {"Dienst":"K10","Start":"15:30","Ende":"16:30","Task":"Service-Support: Besteck sortieren","Typ":"Service-Support"},
+    {"Dienst":"K10","Start":"16:30","Ende":"17:00","Task":"Service-Support: Mise en Place Frühstücksband","Typ":"Service-Support"},
+    {"Dienst":"K10","Start":"17:00","Ende":"17:10","Task":"Hygiene-Switch: Vorbereitung Abendband","Typ":"Service-Support"},
+    {"Dienst":"K10","Start":"17:10","Ende":"18:10","Task":"Service-Support: Bandposition Suppen","Typ":"Service-Support"},
+    {"Dienst":"K10","Start":"18:10","Ende":"18:20","Task":"Reinigung: Wärmewagen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K10","Start":"18:20","Ende":"18:24","Task":"Admin: Checkout","Typ":"Admin"},
+    {"Dienst":"K11","Start":"09:15","Ende":"10:00","Task":"Reinigung: Speisewagen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K11","Start":"10:00","Ende":"10:45","Task":"Logistik: Geschirrbedarf rüsten","Typ":"Logistik"},
+    {"Dienst":"K11","Start":"10:45","Ende":"11:00","Task":"Reinigung: Spezialgeräte reinigen","Typ":"Reinigung"},
+    {"Dienst":"K11","Start":"11:00","Ende":"11:15","Task":"Logistik: Abstellwagen-Management","Typ":"Logistik"},
+    {"Dienst":"K11","Start":"11:15","Ende":"12:00","Task":"Logistik: Vorbereitung Restaurant/Bistro","Typ":"Logistik"},
+    {"Dienst":"K11","Start":"12:00","Ende":"12:15","Task":"Transport: Wegstrecke Restaurant","Typ":"Transport"},
+    {"Dienst":"K11","Start":"12:15","Ende":"13:00","Task":"Logistik: Geschirr-Shuttle","Typ":"Transport"},
+    {"Dienst":"K11","Start":"13:00","Ende":"13:40","Task":"Spülen: Restaurantgeschirr sortieren","Typ":"Spülen"},
+    {"Dienst":"K11","Start":"13:40","Ende":"14:30","Task":"Service-Support: Besteck sortieren & polieren","Typ":"Service-Support"},
+    {"Dienst":"K11","Start":"14:30","Ende":"15:00","Task":"Logistik: Auffüllen Restaurant-Buffet","Typ":"Logistik"},
+    {"Dienst":"K11","Start":"15:00","Ende":"15:30","Task":"Reinigung: Bodenreinigung Restaurant","Typ":"Reinigung"},
+    {"Dienst":"K11","Start":"15:45","Ende":"16:00","Task":"Restaurant Besteck sortieren","Typ":"Service-Support"},
+    {"Dienst":"K11","Start":"16:00","Ende":"16:09","Task":"Admin: Checkout","Typ":"Admin"},
+    {"Dienst":"K13","Start":"06:00","Ende":"06:15","Task":"Reinigung: Maschinen-Check","Typ":"Reinigung"},
+    {"Dienst":"K13","Start":"06:15","Ende":"06:40","Task":"Logistik: Brotannahme","Typ":"Logistik"},
+    {"Dienst":"K13","Start":"06:40","Ende":"07:00","Task":"Logistik: Teezubereitung","Typ":"Logistik"},
+    {"Dienst":"K13","Start":"07:00","Ende":"08:00","Task":"Service-Support: Speisewagen-Management","Typ":"Service-Support"},
+    {"Dienst":"K13","Start":"08:00","Ende":"08:15","Task":"Reinigung: Förderband-Reinigung","Typ":"Reinigung"},
+    {"Dienst":"K13","Start":"08:15","Ende":"08:30","Task":"Logistik: Brotrücklauf","Typ":"Logistik"},
+    {"Dienst":"K13","Start":"08:30","Ende":"08:45","Task":"Brot vorbereiten, Lagerbewirtschaftung","Typ":"Logistik"},
+    {"Dienst":"K13","Start":"08:45","Ende":"09:30","Task":"Logistik: Warenannahme & Lager","Typ":"Logistik"},
+    {"Dienst":"K13","Start":"09:30","Ende":"10:15","Task":"Reinigung: Grossgeräte-Reinigung","Typ":"Reinigung"},
+    {"Dienst":"K13","Start":"10:15","Ende":"10:30","Task":"Logistik: Spezialbestellungen","Typ":"Logistik"},
+    {"Dienst":"K13","Start":"10:30","Ende":"11:00","Task":"Reinigung: Boden Nassreinigung","Typ":"Reinigung"},
+    {"Dienst":"K13","Start":"11:00","Ende":"11:15","Task":"Reinigung: Kipper & Stationsbedarf","Typ":"Reinigung"},
+    {"Dienst":"K13","Start":"11:15","Ende":"11:30","Task":"Transport: TKL-Tabletts holen","Typ":"Transport"},
+    {"Dienst":"K13","Start":"11:30","Ende":"12:15","Task":"Transport: Mittagswagen verteilen","Typ":"Transport"},
+    {"Dienst":"K13","Start":"12:15","Ende":"12:30","Task":"Reinigung: Förderband-Reinigung","Typ":"Reinigung"},
+    {"Dienst":"K13","Start":"12:30","Ende":"13:00","Task":"Reinigung: Bodenreinigung Hauptküche","Typ":"Reinigung"},
+    {"Dienst":"K13","Start":"13:00","Ende":"13:30","Task":"Transport: Speisewagen retour holen","Typ":"Transport"},
+    {"Dienst":"K13","Start":"13:30","Ende":"14:15","Task":"Reinigung: Kipper & Abläufe","Typ":"Reinigung"},
+    {"Dienst":"K13","Start":"14:15","Ende":"15:00","Task":"Logistik: Stationsbedarf","Typ":"Logistik"},
+    {"Dienst":"K13","Start":"15:00","Ende":"15:09","Task":"Admin: Checkout","Typ":"Admin"},
+    {"Dienst":"K14","Start":"10:30","Ende":"11:20","Task":"Reinigung: Kipper & Pfannen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K14","Start":"11:20","Ende":"11:25","Task":"Hygiene-Switch: Schürzenwechsel","Typ":"Service-Support"},
+    {"Dienst":"K14","Start":"11:25","Ende":"12:15","Task":"Service-Support: Bandposition Metalldeckel","Typ":"Service-Support"},
+    {"Dienst":"K14","Start":"12:15","Ende":"12:30","Task":"Logistik: Deckelwagen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K14","Start":"12:30","Ende":"13:30","Task":"Spülen: Restaurantgeschirr sortieren","Typ":"Spülen"},
+    {"Dienst":"K14","Start":"13:30","Ende":"13:45","Task":"Spülen: Restaurantgeschirr sortieren (II)","Typ":"Spülen"},
+    {"Dienst":"K14","Start":"13:45","Ende":"14:30","Task":"Logistik: Verräumen sauberes Geschirr","Typ":"Logistik"},
+    {"Dienst":"K14","Start":"14:30","Ende":"15:00","Task":"Logistik: Wärmewagen-Management","Typ":"Logistik"},
+    {"Dienst":"K14","Start":"15:00","Ende":"16:00","Task":"Logistik: Brot vorbereiten","Typ":"Logistik"},
+    {"Dienst":"K14","Start":"16:00","Ende":"16:30","Task":"Reinigung: Kipper, Gitter, Abläufe","Typ":"Reinigung"},
+    {"Dienst":"K14","Start":"16:30","Ende":"16:50","Task":"Service-Support: Brot schneiden","Typ":"Service-Support"},
+    {"Dienst":"K14","Start":"16:50","Ende":"17:00","Task":"Hygiene-Switch: Schürzenwechsel","Typ":"Service-Support"},
+    {"Dienst":"K14","Start":"17:00","Ende":"17:10","Task":"Transport: Speisewagen bereitstellen","Typ":"Transport"},
+    {"Dienst":"K14","Start":"17:10","Ende":"18:10","Task":"Transport: Abtransport Speisewagen","Typ":"Transport"},
+    {"Dienst":"K14","Start":"18:10","Ende":"18:20","Task":"Logistik: Kaffeekannenwagen auffüllen","Typ":"Logistik"},
+    {"Dienst":"K14","Start":"18:20","Ende":"18:30","Task":"Logistik: Brot versorgen, Tee ansetzen","Typ":"Logistik"},
+    {"Dienst":"K14","Start":"18:30","Ende":"19:15","Task":"Transport: Rückholung Abendessen-Wagen","Typ":"Transport"},
+    {"Dienst":"K14","Start":"19:15","Ende":"19:30","Task":"Spülen: Grobsortierung Rücklauf","Typ":"Spülen"},
+    {"Dienst":"K14","Start":"19:30","Ende":"19:40","Task":"Admin: Hygienekontrolle","Typ":"Admin"},
+    {"Dienst":"K15","Start":"09:15","Ende":"10:00","Task":"Transport: Transport Produktionsgeschirr","Typ":"Transport"},
+    {"Dienst":"K15","Start":"10:00","Ende":"10:45","Task":"Spülen: Casserolier-Betrieb","Typ":"Spülen"},
+    {"Dienst":"K15","Start":"10:45","Ende":"11:00","Task":"Reinigung: Zwischenreinigung Casserolier","Typ":"Reinigung"},
+    {"Dienst":"K15","Start":"11:00","Ende":"11:30","Task":"Spülen: Kasserollier","Typ":"Spülen"},
+    {"Dienst":"K15","Start":"11:30","Ende":"13:00","Task":"Spülen: Casserolier High-Volume","Typ":"Spülen"},
+    {"Dienst":"K15","Start":"13:00","Ende":"13:30","Task":"Logistik: Material verräumen","Typ":"Logistik"},
+    {"Dienst":"K15","Start":"13:30","Ende":"15:00","Task":"Logistik: Abwaschküche Bandautomat abladen","Typ":"Logistik"},
+    {"Dienst":"K15","Start":"15:00","Ende":"15:45","Task":"Reinigung: Speisewagen reinigen","Typ":"Reinigung"},
+    {"Dienst":"K15","Start":"15:45","Ende":"16:15","Task":"Spülen: Letzte Runde Casserolier","Typ":"Spülen"},
+    {"Dienst":"K15","Start":"16:15","Ende":"16:45","Task":"Reinigung: Granuldisk-Wartung","Typ":"Reinigung"},
+    {"Dienst":"K15","Start":"16:45","Ende":"17:00","Task":"Reinigung: Bodenreinigung Casserolier","Typ":"Reinigung"},
+    {"Dienst":"K15","Start":"17:00","Ende":"17:10","Task":"Hygiene-Switch: Schürzenwechsel","Typ":"Service-Support"},
+    {"Dienst":"K15","Start":"17:10","Ende":"18:10","Task":"Service-Support: Bandposition Metalldeckel","Typ":"Service-Support"},
+    {"Dienst":"K15","Start":"18:10","Ende":"18:20","Task":"Reinigung: Arbeitsplatz reinigen","Typ":"Reinigung"},
+    {"Dienst":"K15","Start":"18:20","Ende":"18:24","Task":"Admin: Checkout","Typ":"Admin"},
+]